@@ -1,18 +1,258 @@
+import argparse
+import csv
 import requests
-import pandas as pd
+import hashlib
 import json
+import logging
+import math
+import orjson
+import os
+import re
+import threading
 import urllib3
+import xlsxwriter
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import wraps
+from xml.sax.saxutils import escape
+from zipfile import ZIP_DEFLATED, ZipFile
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Disable SSL warnings
 urllib3.disable_warnings()
 
+log = logging.getLogger(__name__)
+
+# Endpoints fetched per API call, and how many pages are requested at once
+PAGE_SIZE = 5000
+MAX_CONCURRENT_PAGES = 8
+
+# Responses are kept here with their ETag/Last-Modified for conditional GETs
+CACHE_DIR = '.ndi_cache'
+
+# Session cookies are saved here so later runs can skip the login
+TOKEN_FILE = os.path.expanduser('~/.ndi_token')
+
+# Serialized dicts remembered by ValueFormatter before its cache is reset
+FORMAT_CACHE_SIZE = 10000
+
+# Rows inspected when sizing report columns
+WIDTH_SAMPLE_ROWS = 10000
+
+# Deflate level for the raw xlsx writer; level 1 is nearly as small as the
+# default and much cheaper on large reports
+XLSX_COMPRESSLEVEL = 1
+
+# Excel refuses cells longer than this, so longer values are truncated
+XLSX_MAX_CELL_CHARS = 32767
+
+# Fixed parts of the single-sheet workbook written by _write_xlsx_fast;
+# style 1 is the bold white-on-blue header
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Endpoints" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font></fonts>'
+        '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill>'
+        '<fill><patternFill patternType="solid"><fgColor rgb="FF366092"/></patternFill></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+# Sheet XML around the streamed rows, with the header row frozen
+XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+XLSX_SHEET_TAIL = '</sheetData></worksheet>'
+
+# Control characters that are not allowed anywhere in XML 1.0
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _progress(iterable, desc):
+    """Wrap a long loop in a rate-limited tqdm progress bar, if tqdm is installed"""
+    if tqdm is None:
+        return iterable
+    return tqdm(iterable, desc=desc, unit='row', mininterval=0.5, leave=False)
+
+def _column_letter(idx):
+    """Convert a zero-based column index to its Excel letter (0 -> A, 26 -> AA)"""
+    letters = ''
+    idx += 1
+    while idx:
+        idx, remainder = divmod(idx - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def _xlsx_row(row_num, columns, values, style=0):
+    """Render one sheet row of inline string cells, leaving empty values blank"""
+    style_attr = f' s="{style}"' if style else ''
+    cells = ''.join(
+        f'<c r="{col}{row_num}" t="inlineStr"{style_attr}>'
+        f'<is><t xml:space="preserve">{escape(_ILLEGAL_XML_CHARS.sub("", value[:XLSX_MAX_CELL_CHARS]))}</t></is></c>'
+        for col, value in zip(columns, values) if value
+    )
+    return f'<row r="{row_num}">{cells}</row>'
+
+class ValueFormatter:
+    """Turns endpoint field values into report strings"""
+    def __init__(self):
+        self._fmt_cache = {}
+        self._formatters = {
+            list: self._format_list,
+            tuple: self._format_list,
+            dict: self._format_dict,
+            str: str
+        }
+
+    def _format_dict(self, value):
+        """Format a dictionary, preferring its name or value field"""
+        if 'name' in value:
+            return str(value['name'])
+        elif 'value' in value:
+            return str(value['value'])
+        
+        # If no specific field to extract, use the whole dict. The same dicts
+        # repeat across many endpoints, so remember their serialized form;
+        # value types and float signs are part of the key so 1, 1.0, True
+        # and -0.0 stay distinct
+        try:
+            key = tuple(
+                (k, type(v), v, math.copysign(1.0, v) if type(v) is float else None)
+                for k, v in value.items()
+            )
+            return self._fmt_cache[key]
+        except TypeError:
+            # Nested lists/dicts are unhashable, serialize without caching
+            return _dumps(value)
+        except KeyError:
+            if len(self._fmt_cache) >= FORMAT_CACHE_SIZE:
+                # Mostly unique dicts are not worth keeping, start over
+                self._fmt_cache.clear()
+            formatted = self._fmt_cache[key] = _dumps(value)
+            return formatted
+
+    def _format_list(self, value):
+        """Format a list or tuple as a comma separated string"""
+        return ', '.join(
+            self._format_dict(item) if isinstance(item, dict) else str(item)
+            for item in value
+        )
+
+    def format_value(self, value):
+        """Format a value for Excel output"""
+        # Dispatch on the exact type first to skip the isinstance ladder
+        formatter = self._formatters.get(type(value))
+        if formatter is not None:
+            return formatter(value)
+        if isinstance(value, (list, tuple)):
+            return self._format_list(value)
+        elif isinstance(value, dict):
+            return self._format_dict(value)
+        else:
+            return str(value)
+
+    def format_rows(self, columns, entries):
+        """Format endpoint entries into rows of strings, blank where a key is missing"""
+        format_value = self.format_value
+        return [
+            [format_value(entry[key]) if key in entry else '' for key in columns]
+            for entry in entries
+        ]
+
+def _dumps(value):
+    """Serialize a value to a JSON string with orjson"""
+    try:
+        return orjson.dumps(value).decode()
+    except TypeError:
+        # orjson rejects e.g. non-string keys, which the stdlib handles
+        return json.dumps(value)
+
+def _relogin_on_unauthorized(method):
+    """Retry a request once after logging in again if NDI answers 401"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        login_count = self._login_count
+        try:
+            return method(self, *args, **kwargs)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 401 or not self._credentials:
+                raise
+        with self._login_lock:
+            # Concurrent page fetches may all see the 401; log in only once
+            if self._login_count == login_count:
+                log.info("Saved NDI session expired, logging in again...")
+                self.login(*self._credentials)
+        return method(self, *args, **kwargs)
+    return wrapper
+
 class EndpointsReport:
     def __init__(self, ndi_ip):
         self.base_url = f"https://{ndi_ip}"
+        self.formatter = ValueFormatter()
         self.session = requests.Session()
         self.session.verify = False
-        self.session.headers.update({'Connection': 'close'})
+        # Keep connections alive so login and every page reuse the same TLS sessions
+        # raise_on_status=False hands the last 5xx back, so raise_for_status() still reports it
+        retries = urllib3.Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                                raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+        self.session.mount('https://', adapter)
+        # requests already negotiates every compression urllib3 can decode
+        # (gzip, deflate, plus br/zstd when available); just ask for JSON
+        self.session.headers.update({'Accept': 'application/json'})
+        self._credentials = None
+        self._login_count = 0
+        self._login_lock = threading.Lock()
+        self._token_account = None
+        self.load_token()
 
     def login(self, domain, username, password):
         """Login to NDI"""
@@ -24,182 +264,317 @@ class EndpointsReport:
         }
         response = self.session.post(login_url, json=credentials, timeout=(5, 30))
         response.raise_for_status()
+        self._credentials = (domain, username, password)
+        self._login_count += 1
+        self.save_token()
+
+    def ensure_login(self, domain, username, password):
+        """Login to NDI unless a saved session is available, which is used until it expires"""
+        if self.session.cookies and self._token_account == (domain, username):
+            log.info("Reusing saved NDI session...")
+            self._credentials = (domain, username, password)
+        else:
+            # Never reuse a session saved for another account
+            self.session.cookies.clear()
+            self.login(domain, username, password)
+
+    def load_token(self):
+        """Load saved session cookies for this NDI, if any"""
+        try:
+            with open(TOKEN_FILE) as f:
+                token = json.load(f)
+            if not isinstance(token, dict) or token.get('base_url') != self.base_url:
+                return
+            for cookie in token['cookies']:
+                self.session.cookies.set_cookie(create_cookie(
+                    cookie['name'], cookie['value'],
+                    domain=cookie['domain'], path=cookie['path'],
+                    expires=cookie['expires'], secure=cookie['secure']
+                ))
+            self._token_account = tuple(token['account'])
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            # A corrupt or foreign token file just means logging in again
+            log.info(f"Ignoring saved NDI session: {e}")
+            self.session.cookies.clear()
+
+    def save_token(self):
+        """Save the session cookies, readable by the current user only"""
+        self._token_account = self._credentials[:2]
+        # Only plain cookie fields are stored, as JSON, so loading the file
+        # can never run code the way unpickling would
+        token = {
+            'base_url': self.base_url,
+            'account': list(self._token_account),
+            'cookies': [
+                {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'expires': cookie.expires,
+                    'secure': cookie.secure
+                }
+                for cookie in self.session.cookies
+            ]
+        }
+        try:
+            fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # The mode above only applies to new files, so tighten existing ones too
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(token, f)
+        except OSError as e:
+            # Not being able to save the session only costs a login next run
+            log.warning(f"Could not save NDI session to {TOKEN_FILE}: {e}")
+
+    def _cache_paths(self, url):
+        """Return the (validators, body) cache file paths for a URL"""
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return (os.path.join(CACHE_DIR, f"{key}.meta"),
+                os.path.join(CACHE_DIR, f"{key}.body"))
+
+    def _write_cache_file(self, path, content):
+        """Atomically replace a cache file"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    @_relogin_on_unauthorized
+    def get_json(self, url):
+        """GET a JSON document, revalidating any cached copy with its ETag"""
+        meta_path, body_path = self._cache_paths(url)
+        validators = {}
+        if os.path.exists(meta_path) and os.path.exists(body_path):
+            with open(meta_path) as f:
+                validators = json.load(f)
+        
+        headers = {}
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        # Stream the body so it is read straight off the socket into one buffer
+        with self.session.get(url, headers=headers, stream=True, timeout=(5, 30)) as response:
+            if response.status_code == 304:
+                with open(body_path, 'rb') as f:
+                    return orjson.loads(f.read())
+            if not response.ok:
+                # Load the error body before the connection is released
+                response.content
+                response.raise_for_status()
+            response.raw.decode_content = True
+            try:
+                content = response.raw.read()
+            except urllib3.exceptions.HTTPError as e:
+                # Reading raw bypasses requests' own wrapping of read timeouts
+                # and truncated bodies, so surface them as requests errors
+                raise requests.exceptions.ConnectionError(e, request=response.request) from e
+        
+        validators = {}
+        if 'ETag' in response.headers:
+            validators['etag'] = response.headers['ETag']
+        if 'Last-Modified' in response.headers:
+            validators['last_modified'] = response.headers['Last-Modified']
+        if validators:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self._write_cache_file(body_path, content)
+            self._write_cache_file(meta_path, json.dumps(validators).encode())
+        return orjson.loads(content)
+
+    def get_endpoints_page(self, site_name, offset, count=PAGE_SIZE):
+        """Get a single page of endpoints data from NDI"""
+        url = f"{self.base_url}/sedgeapi/v1/cisco-nir/api/api/v1/endpoints?siteName={site_name}&count={count}&offset={offset}"
+        return self.get_json(url)
 
     def get_all_endpoints(self, site_name="INPUT_FABRIC_NAME_HERE"):
         """Get all endpoints data from NDI"""
-        # First get total count
-        url = f"{self.base_url}/sedgeapi/v1/cisco-nir/api/api/v1/endpoints?siteName={site_name}&count=1"
-        
-        print("Getting total count...")
+        log.info("Getting total count...")
         try:
-            response = self.session.get(url, timeout=(5, 30))
-            response.raise_for_status()
-            data = response.json()
+            # First get total count
+            data = self.get_endpoints_page(site_name, offset=0, count=1)
             
             total_count = data.get('totalItemsCount', 0)
-            print(f"Total endpoints available: {total_count}")
+            log.info(f"Total endpoints available: {total_count}")
             
             if total_count == 0:
-                print("No endpoints found for the given site name")
+                log.warning("No endpoints found for the given site name")
                 return {"entries": [], "totalItemsCount": 0}
             
-            # Now fetch all records with the total count
-            url = f"{self.base_url}/sedgeapi/v1/cisco-nir/api/api/v1/endpoints?siteName={site_name}&count={total_count}"
-            print(f"Fetching all endpoints with URL: {url}")
+            # Now fetch all records page by page, several pages at a time
+            offsets = [page * PAGE_SIZE for page in range(math.ceil(total_count / PAGE_SIZE))]
+            log.info(f"Fetching all endpoints in {len(offsets)} page(s) of {PAGE_SIZE}")
             
-            response = self.session.get(url, timeout=(5, 30))
-            response.raise_for_status()
-            data = response.json()
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as executor:
+                pages = executor.map(lambda offset: self.get_endpoints_page(site_name, offset), offsets)
+                all_entries = []
+                for page in pages:
+                    all_entries.extend(page.get('entries', []))
             
-            all_entries = data.get('entries', [])
-            print(f"Fetched {len(all_entries)} endpoints")
+            log.info(f"Fetched {len(all_entries)} endpoints")
             return {"entries": all_entries, "totalItemsCount": total_count}
             
         except requests.exceptions.RequestException as e:
-            print(f"Error details:")
-            print(f"Status code: {e.response.status_code if hasattr(e, 'response') else 'N/A'}")
-            print(f"Response content: {e.response.text if hasattr(e, 'response') else 'N/A'}")
+            log.error(f"Error details:")
+            log.error(f"Status code: {getattr(e.response, 'status_code', 'N/A')}")
+            log.error(f"Response content: {e.response.text if e.response is not None else 'N/A'}")
             raise
 
     def format_value(self, value):
         """Format a value for Excel output"""
-        if isinstance(value, (list, tuple)):
-            # Convert each item in the list
-            formatted_items = []
-            for item in value:
-                if isinstance(item, dict):
-                    # For dictionaries, try to get meaningful values
-                    if 'name' in item:
-                        formatted_items.append(str(item['name']))
-                    elif 'value' in item:
-                        formatted_items.append(str(item['value']))
-                    else:
-                        # If no specific field to extract, use the whole dict
-                        formatted_items.append(json.dumps(item))
-                else:
-                    formatted_items.append(str(item))
-            return ', '.join(formatted_items)
-        elif isinstance(value, dict):
-            # For dictionaries, try to get meaningful values
-            if 'name' in value:
-                return str(value['name'])
-            elif 'value' in value:
-                return str(value['value'])
-            else:
-                return json.dumps(value)
-        else:
-            return str(value)
+        return self.formatter.format_value(value)
 
     def process_endpoints_data(self, data):
-        """Process endpoints data and create DataFrame"""
+        """Process endpoints data into (columns, rows) of report strings"""
         entries = data.get('entries', [])
-        print(f"Processing {len(entries)} endpoints...")
+        log.info(f"Processing {len(entries)} endpoints...")
         
-        # First, create the DataFrame
-        df = pd.DataFrame(entries)
+        # Columns are the union of entry keys, in first-seen order
+        columns = list(dict.fromkeys(key for entry in entries for key in entry))
         
-        # Process each column
-        for column in df.columns:
-            df[column] = df[column].apply(self.format_value)
+        return columns, self.formatter.format_rows(columns, _progress(entries, "Formatting"))
+
+    def _write_xlsx_fast(self, columns, rows, output_filename):
+        """Write the report as plain data with a styled header row only"""
+        # The sheet XML is generated directly and streamed into the zip, so
+        # no per-cell objects or style lookups are involved
+        header_row = [col.replace('_', ' ').title() for col in columns]
+        columns = [_column_letter(idx) for idx in range(len(columns))]
         
-        return df
+        with ZipFile(output_filename, 'w', ZIP_DEFLATED, compresslevel=XLSX_COMPRESSLEVEL) as xlsx:
+            for part_name, content in XLSX_STATIC_PARTS.items():
+                xlsx.writestr(part_name, content)
+            with xlsx.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(XLSX_SHEET_HEAD.encode())
+                sheet.write(_xlsx_row(1, columns, header_row, style=1).encode())
+                for row_num, row in enumerate(_progress(rows, "Writing"), start=2):
+                    sheet.write(_xlsx_row(row_num, columns, row).encode())
+                sheet.write(XLSX_SHEET_TAIL.encode())
 
-    def generate_report(self, site_name="ACI-ODC"):
-        """Generate endpoints report"""
+    def _write_xlsx_styled(self, columns, rows, output_filename):
+        """Write the report with full xlsxwriter styling"""
+        # Create the workbook with xlsxwriter. Endpoint values are never
+        # links, so skip the per-string URL scan, and stream rows to disk with
+        # constant_memory (rows below are written strictly top to bottom)
+        options = {'strings_to_urls': False, 'use_zip64': True, 'constant_memory': True}
+        with xlsxwriter.Workbook(output_filename, options) as workbook:
+            worksheet = workbook.add_worksheet('Endpoints')
+            
+            # Define formats
+            header_format = workbook.add_format({
+                'bold': True,
+                'text_wrap': True,
+                'valign': 'vcenter',
+                'align': 'center',
+                'bg_color': '#366092',
+                'font_color': 'white',
+                'border': 1,
+                'border_color': '#D9D9D9',
+                'font_size': 11
+            })
+            
+            data_format = workbook.add_format({
+                'text_wrap': True,
+                'valign': 'vcenter',
+                'align': 'left',
+                'border': 1,
+                'border_color': '#D9D9D9',
+                'font_size': 10
+            })
+            
+            # Adjust column widths based on content, before any row is written
+            sample = rows[:WIDTH_SAMPLE_ROWS]
+            for idx, col in enumerate(columns):
+                # Get maximum length in the column, sampling the first rows only
+                max_length = max(
+                    max((len(row[idx]) for row in sample), default=0),
+                    len(col.replace('_', ' ').title())  # Account for formatted header
+                )
+                # Set width with some padding, but cap at 50
+                width = min(max_length + 3, 50)
+                worksheet.set_column(idx, idx, width)
+            
+            # Set row height for header
+            worksheet.set_row(0, 30)
+            
+            # Write headers with formatting, making header text more readable
+            header_row = [col.replace('_', ' ').title() for col in columns]
+            worksheet.write_row(0, 0, header_row, header_format)
+            
+            # Write data with formatting, one row call at a time
+            for row_num, row in enumerate(_progress(rows, "Writing"), start=1):
+                worksheet.write_row(row_num, 0, row, data_format)
+            
+            # Freeze the header row
+            worksheet.freeze_panes(1, 0)
+            
+            # Add alternating row colors with a single conditional format
+            # (Excel rows are 1-based, so data rows 1, 3, ... are even there)
+            alt_row_format = workbook.add_format({'bg_color': '#F2F2F2'})
+            worksheet.conditional_format(1, 0, len(rows), len(columns) - 1, {
+                'type': 'formula',
+                'criteria': '=MOD(ROW(),2)=0',
+                'format': alt_row_format
+            })
+
+    def generate_report(self, site_name="ACI-ODC", styled=False, output_format='xlsx'):
+        """Generate endpoints report as 'xlsx' or 'csv', with full Excel styling if styled is set"""
         try:
             # Get all endpoints data
-            print("Fetching all endpoints data...")
+            log.info("Fetching all endpoints data...")
             endpoints_data = self.get_all_endpoints(site_name)
             
             if not endpoints_data.get('entries'):
-                print("No data to process")
+                log.warning("No data to process")
                 return None
             
             # Process data
-            print("Processing data...")
-            df = self.process_endpoints_data(endpoints_data)
+            log.info("Processing data...")
+            columns, rows = self.process_endpoints_data(endpoints_data)
             
             # Generate timestamp for filename
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_filename = f'endpoints_report_{timestamp}.xlsx'
-            
-            print("Generating Excel report...")
-            # Create Excel writer with xlsxwriter engine
-            with pd.ExcelWriter(output_filename, engine='xlsxwriter') as writer:
-                df.to_excel(writer, sheet_name='Endpoints', index=False)
-                
-                # Get workbook and worksheet objects
-                workbook = writer.book
-                worksheet = writer.sheets['Endpoints']
-                
-                # Define formats
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'vcenter',
-                    'align': 'center',
-                    'bg_color': '#366092',
-                    'font_color': 'white',
-                    'border': 1,
-                    'border_color': '#D9D9D9',
-                    'font_size': 11
-                })
-                
-                data_format = workbook.add_format({
-                    'text_wrap': True,
-                    'valign': 'vcenter',
-                    'align': 'left',
-                    'border': 1,
-                    'border_color': '#D9D9D9',
-                    'font_size': 10
-                })
-                
-                # Set row height for header
-                worksheet.set_row(0, 30)
-                
-                # Write headers with formatting
-                for col_num, value in enumerate(df.columns.values):
-                    # Make header text more readable
-                    header_text = value.replace('_', ' ').title()
-                    worksheet.write(0, col_num, header_text, header_format)
-                
-                # Write data with formatting
-                for row in range(len(df)):
-                    for col in range(len(df.columns)):
-                        worksheet.write(row + 1, col, df.iloc[row, col], data_format)
-                
-                # Adjust column widths based on content
-                for idx, col in enumerate(df.columns):
-                    # Get maximum length in the column
-                    max_length = max(
-                        df[col].astype(str).apply(len).max(),
-                        len(col.replace('_', ' ').title())  # Account for formatted header
-                    )
-                    # Set width with some padding, but cap at 50
-                    width = min(max_length + 3, 50)
-                    worksheet.set_column(idx, idx, width)
-                
-                # Freeze the header row
-                worksheet.freeze_panes(1, 0)
-                
-                # Add alternating row colors
-                for row in range(1, len(df) + 1):
-                    if row % 2 == 0:
-                        worksheet.set_row(row, None, None, {'level': 1, 'hidden': False})
-                    else:
-                        worksheet.set_row(row, None, workbook.add_format({'bg_color': '#F2F2F2'}))
-            
-            print(f"Report has been generated: {output_filename}")
-            print(f"Total endpoints processed: {len(df)}")
+            output_filename = f'endpoints_report_{timestamp}.{output_format}'
+            
+            if output_format == 'csv':
+                log.info("Generating CSV report...")
+                # utf-8-sig adds a BOM so Excel reads non-ASCII names correctly
+                with open(output_filename, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    writer.writerows(rows)
+            else:
+                log.info("Generating Excel report...")
+                if styled:
+                    self._write_xlsx_styled(columns, rows, output_filename)
+                else:
+                    self._write_xlsx_fast(columns, rows, output_filename)
+            
+            log.info(f"Report has been generated: {output_filename}")
+            log.info(f"Total endpoints processed: {len(rows)}")
             return output_filename
             
         except Exception as e:
-            print(f"Error occurred while generating report: {e}")
-            if hasattr(e, 'response'):
-                print(f"Response content: {e.response.text}")
+            log.error(f"Error occurred while generating report: {e}")
+            if getattr(e, 'response', None) is not None:
+                log.error(f"Response content: {e.response.text}")
             return None
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    parser = argparse.ArgumentParser(description="Gather all endpoints via NDI")
+    parser.add_argument('--format', dest='output_format', choices=['xlsx', 'csv'], default='xlsx',
+                        help="report file format; csv is much faster for large fabrics")
+    parser.add_argument('--styled', action='store_true',
+                        help="apply full Excel styling (slower, xlsx only)")
+    args = parser.parse_args()
+    if args.styled and args.output_format == 'csv':
+        parser.error("--styled only applies to xlsx reports")
+    
     # NDI details
     ndi_ip = "NDI_IP"
     domain = "METHOD"
@@ -211,21 +586,22 @@ def main():
     
     try:
         # Login to NDI
-        print("Logging in to NDI...")
-        report.login(domain, username, password)
+        log.info("Logging in to NDI...")
+        report.ensure_login(domain, username, password)
         
         # Generate report
-        print("Generating report...")
+        log.info("Generating report...")
         site_name = input("Enter site name: ") or "INPUT_FABRIC_NAME_HERE"
-        output_file = report.generate_report(site_name)
+        output_file = report.generate_report(site_name, styled=args.styled,
+                                             output_format=args.output_format)
         
         if output_file:
-            print("Script completed successfully!")
+            log.info("Script completed successfully!")
             
     except Exception as e:
-        print(f"Error: {str(e)}")
-        if hasattr(e, 'response'):
-            print(f"Response content: {e.response.text}")
+        log.error(f"Error: {str(e)}")
+        if getattr(e, 'response', None) is not None:
+            log.error(f"Response content: {e.response.text}")
 
 if __name__ == "__main__":
     main()